@@ -0,0 +1,123 @@
+"""
+Numeric kernels for CPU-bound task handlers.
+
+Kernels are written in the subset of Python that Numba compiles and are
+JIT-compiled on first use with `nogil=True`, so handlers can run them on
+worker threads via `asyncio.to_thread` without holding the GIL. Numba is
+imported lazily (the import alone takes hundreds of milliseconds) and is
+optional: without it the same kernels run as plain Python.
+
+Compiled code is cached on disk (`cache=True`); point NUMBA_CACHE_DIR at a
+persistent, writable directory to reuse it across worker restarts.
+"""
+
+import logging
+import random
+import threading
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _sma_crossover_kernel(prices: Any, fast: int, slow: int) -> Tuple[float, float]:
+    """
+    Backtest a long-only moving-average crossover strategy.
+
+    The position decided at the close of bar i applies to the return from
+    bar i to bar i + 1.
+
+    Returns:
+        (total_return, max_drawdown) as fractions
+    """
+    equity = 1.0
+    peak = 1.0
+    max_drawdown = 0.0
+    position = 0.0
+    fast_sum = 0.0
+    slow_sum = 0.0
+
+    for i in range(len(prices)):
+        if i > 0:
+            equity *= 1.0 + position * (prices[i] / prices[i - 1] - 1.0)
+            if equity > peak:
+                peak = equity
+            drawdown = 1.0 - equity / peak
+            if drawdown > max_drawdown:
+                max_drawdown = drawdown
+
+        fast_sum += prices[i]
+        slow_sum += prices[i]
+        if i >= fast:
+            fast_sum -= prices[i - fast]
+        if i >= slow:
+            slow_sum -= prices[i - slow]
+        if i + 1 >= slow:
+            position = 1.0 if fast_sum / fast > slow_sum / slow else 0.0
+
+    return equity - 1.0, max_drawdown
+
+
+_kernel: Optional[Callable[..., Tuple[float, float]]] = None
+_as_array: Callable[[Sequence[float]], Any] = list
+_kernel_lock = threading.Lock()
+
+
+def _load_kernel() -> Callable[..., Tuple[float, float]]:
+    """Compile the kernel with Numba on first use, falling back to Python."""
+    global _kernel, _as_array
+
+    with _kernel_lock:
+        if _kernel is not None:
+            return _kernel
+
+        try:
+            import numba
+            import numpy as np
+        except ImportError:
+            logger.warning("numba not installed, numeric kernels run as plain Python")
+            _kernel = _sma_crossover_kernel
+            return _kernel
+
+        def to_float64_array(values: Sequence[float]) -> Any:
+            return np.asarray(values, dtype=np.float64)
+
+        _as_array = to_float64_array
+        _kernel = numba.njit(cache=True, nogil=True)(_sma_crossover_kernel)
+        return _kernel
+
+
+def synthetic_prices(bars: int, seed: str, start: float = 100.0) -> List[float]:
+    """
+    Generate a deterministic random-walk price series.
+
+    Args:
+        bars: Number of price bars
+        seed: Seed for the random walk (e.g. the strategy ID)
+        start: Initial price
+
+    Returns:
+        List of prices
+    """
+    rng = random.Random(seed)
+    prices = [start]
+    for _ in range(bars - 1):
+        prices.append(prices[-1] * (1.0 + rng.gauss(0.0, 0.01)))
+    return prices
+
+
+def backtest(prices: Sequence[float], fast: int = 10, slow: int = 30) -> Tuple[float, float]:
+    """
+    Run the moving-average crossover backtest over a price series.
+
+    Blocking and CPU-bound: call it via `asyncio.to_thread` from handlers.
+
+    Args:
+        prices: Price series
+        fast: Fast moving-average window
+        slow: Slow moving-average window
+
+    Returns:
+        (total_return, max_drawdown) as fractions
+    """
+    kernel = _kernel or _load_kernel()
+    return kernel(_as_array(prices), fast, slow)
@@ -6,15 +6,26 @@ integrate with TaskFlow's Go worker system via gRPC.
 """
 
 import asyncio
+import functools
 import importlib
 import logging
+import os
 import signal
 import time
 from concurrent import futures
-from typing import Any, AsyncIterator, Callable, Dict, Optional, cast
+from typing import (
+    Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, cast
+)
+
+# Select the native protobuf backend before google.protobuf is first imported;
+# the pure-Python implementation is far slower at encoding and decoding.
+os.environ.setdefault("PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION", "upb")
 
 import grpc
 from google.protobuf import struct_pb2
+from google.protobuf.internal import api_implementation
+
+import numeric
 
 pb: Any = None
 pb_grpc: Any = None
@@ -66,15 +77,157 @@ assert pb is not None
 pb = cast(Any, pb)
 pb_grpc = cast(Any, pb_grpc)
 
+_log_level_name = (os.environ.get("LOG_LEVEL") or "INFO").upper()
+_log_level = logging.getLevelName(_log_level_name)  # str for unknown names
+
 logging.basicConfig(
-    level=logging.INFO,
+    level=_log_level if isinstance(_log_level, int) else logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
 
+if not isinstance(_log_level, int):
+    logger.warning("Unknown LOG_LEVEL %r, falling back to INFO", _log_level_name)
+
+
+# gRPC server tuning. grpc.aio serves RPCs on the event loop; the thread pool
+# only backs sync handlers and blocking work migrated off the loop.
+SERVER_OPTIONS = [
+    ("grpc.so_reuseport", 1),
+    ("grpc.max_concurrent_streams", 1024),
+    ("grpc.keepalive_time_ms", 30000),
+    ("grpc.http2.max_pings_without_data", 0),
+]
+SERVER_THREAD_POOL_SIZE = max(32, (os.cpu_count() or 4) * 4)
+
+
+class TaskState:
+    """Per-task state shared between the servicer and the running handler."""
+
+    __slots__ = ("cancel_event", "start_ns", "progress")
+
+    def __init__(self, task_id: str):
+        self.cancel_event = asyncio.Event()
+        self.start_ns = time.monotonic_ns()
+        self.progress = ProgressReporter(task_id)
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+
+# Responses a handler may produce ahead of the gRPC sender, per task
+RESPONSE_QUEUE_SIZE = 64
+
+_END_OF_STREAM = object()
+# Put on an empty queue to wake the sender when the task is cancelled or the
+# producer stops
+_WAKE = object()
+
+
+class _StreamFailure:
+    """Carries a handler exception from the producer task to the sender."""
+
+    __slots__ = ("error",)
+
+    def __init__(self, error: Exception):
+        self.error = error
+
+
+async def _pump(stream: AsyncIterator[Any], queue: asyncio.Queue):
+    """Drain `stream` into `queue`, ending with _END_OF_STREAM or a _StreamFailure."""
+    try:
+        async for item in stream:
+            if queue.full():
+                await queue.put(item)
+            else:
+                queue.put_nowait(item)
+    except Exception as e:
+        await queue.put(_StreamFailure(e))
+    else:
+        await queue.put(_END_OF_STREAM)
+
+
+def _wake_if_empty(queue: asyncio.Queue) -> Callable[[Any], None]:
+    def wake(_: Any):
+        # A blocked sender only waits on an empty queue; otherwise it sees
+        # the change when it checks before its next get
+        if queue.empty():
+            queue.put_nowait(_WAKE)
+    return wake
+
+
+async def _until_cancelled(
+    stream: AsyncIterator[Any],
+    cancel_event: asyncio.Event
+) -> AsyncIterator[Any]:
+    """
+    Yield items from `stream` until it is exhausted or `cancel_event` is set.
+
+    The stream is drained by a producer task into a bounded queue, so the
+    handler keeps working while earlier responses are sent and only blocks
+    once the queue is full. The sender awaits the queue directly; a single
+    waiter on the event and the producer's completion wake it with `_WAKE`,
+    so a cancel also interrupts a handler that is blocked between updates
+    without any per-item tasks. Handing items between the two tasks still
+    costs more per item than iterating the handler inline; that is the price
+    of overlapping handler work with sending and of prompt cancellation.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=RESPONSE_QUEUE_SIZE)
+    wake = _wake_if_empty(queue)
+    producer = asyncio.ensure_future(_pump(stream, queue))
+    producer.add_done_callback(wake)
+    cancel_waiter = asyncio.ensure_future(cancel_event.wait())
+    cancel_waiter.add_done_callback(wake)
+    try:
+        while True:
+            if cancel_event.is_set():
+                return
+            if producer.done() and queue.empty():
+                # The producer ended without a marker: the handler raised a
+                # BaseException such as CancelledError that _pump does not catch
+                if producer.cancelled():
+                    raise asyncio.CancelledError()
+                error = producer.exception()
+                if error is not None:
+                    raise error
+                return
+
+            item = queue.get_nowait() if not queue.empty() else await queue.get()
+            if item is _WAKE:
+                continue
+            if item is _END_OF_STREAM:
+                return
+            if type(item) is _StreamFailure:
+                raise item.error
+            yield item
+    finally:
+        cancel_waiter.remove_done_callback(wake)
+        cancel_waiter.cancel()
+        if not producer.done():
+            producer.remove_done_callback(wake)
+            producer.cancel()
+            await asyncio.wait((producer,))
+        elif not producer.cancelled():
+            producer.exception()  # mark an unhandled failure as retrieved
+        aclose = getattr(stream, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+
+# Shared response for cancelling unknown or finished tasks; the caller
+# already knows which task_id it asked about
+_CANCEL_NOT_FOUND = pb.CancelTaskResponse(
+    success=False,
+    message="Task not found or already completed"
+)
+
 
 # Type alias for handler function
-HandlerFunc = Callable[[Any, grpc.aio.ServicerContext, dict], AsyncIterator[Any]]
+HandlerFunc = Callable[[Any, grpc.aio.ServicerContext, TaskState], AsyncIterator[Any]]
 
 
 class TaskExecutorServicer:
@@ -86,8 +239,12 @@ class TaskExecutorServicer:
 
     def __init__(self):
         self.handlers: Dict[str, HandlerFunc] = {}
-        self.active_tasks: Dict[str, dict] = {}
+        self._handler_lookup = self.handlers.get
+        self.active_tasks: Dict[str, TaskState] = {}
         self._shutdown = False
+        # Health check details that only change on registration
+        self._handlers_count_str = "0"
+        self._handlers_csv = ""
 
     def register_handler(self, method: str, handler: HandlerFunc):
         """
@@ -98,7 +255,9 @@ class TaskExecutorServicer:
             handler: Async generator function that processes the task
         """
         self.handlers[method] = handler
-        logger.info(f"Registered handler for method: {method}")
+        self._handlers_count_str = str(len(self.handlers))
+        self._handlers_csv = ",".join(self.handlers.keys())
+        logger.info("Registered handler for method: %s", method)
 
     async def ExecuteTask(
         self,
@@ -111,19 +270,18 @@ class TaskExecutorServicer:
         task_id = request.task_id
         method = request.task_type  # task_type contains the method name
 
-        logger.info(f"Task {task_id}: executing method '{method}'")
+        logger.info("Task %s: executing method %r", task_id, method)
 
-        # Initialize task state
-        self.active_tasks[task_id] = {
-            "cancelled": False,
-            "start_time": time.time()
-        }
+        # Initialize task state; the context callback fires when the client
+        # cancels or the RPC otherwise terminates
+        state = self.active_tasks[task_id] = TaskState(task_id)
+        context.add_done_callback(lambda _: state.cancel())
 
         try:
             # Find handler
-            handler = self.handlers.get(method)
+            handler = self._handler_lookup(method)
             if not handler:
-                logger.error(f"Task {task_id}: unknown method '{method}'")
+                logger.error("Task %s: unknown method %r", task_id, method)
                 yield pb.ExecuteTaskResponse(
                     error=pb.ErrorDetail(
                         code="UNKNOWN_METHOD",
@@ -134,20 +292,24 @@ class TaskExecutorServicer:
                 return
 
             # Execute handler
-            async for response in handler(request, context, self.active_tasks[task_id]):
-                if context.cancelled() or self.active_tasks[task_id].get("cancelled"):
-                    logger.warning(f"Task {task_id}: cancelled")
-                    yield pb.ExecuteTaskResponse(
-                        result=pb.TaskResult(
-                            task_id=task_id,
-                            status=pb.TASK_STATUS_CANCELLED
-                        )
-                    )
-                    return
+            async for response in _until_cancelled(
+                handler(request, context, state), state.cancel_event
+            ):
                 yield response
+                state.progress.release(response)
+
+            if state.cancelled:
+                logger.warning("Task %s: cancelled", task_id)
+                yield pb.ExecuteTaskResponse(
+                    result=pb.TaskResult(
+                        task_id=task_id,
+                        status=pb.TASK_STATUS_CANCELLED
+                    )
+                )
+                return
 
             # Send completion result
-            duration_ms = int((time.time() - self.active_tasks[task_id]["start_time"]) * 1000)
+            duration_ms = (time.monotonic_ns() - state.start_ns) // 1_000_000
             yield pb.ExecuteTaskResponse(
                 result=pb.TaskResult(
                     task_id=task_id,
@@ -155,10 +317,10 @@ class TaskExecutorServicer:
                     duration_ms=duration_ms
                 )
             )
-            logger.info(f"Task {task_id}: completed in {duration_ms}ms")
+            logger.info("Task %s: completed in %dms", task_id, duration_ms)
 
         except asyncio.CancelledError:
-            logger.warning(f"Task {task_id}: cancelled")
+            logger.warning("Task %s: cancelled", task_id)
             yield pb.ExecuteTaskResponse(
                 result=pb.TaskResult(
                     task_id=task_id,
@@ -166,7 +328,7 @@ class TaskExecutorServicer:
                 )
             )
         except Exception as e:
-            logger.exception(f"Task {task_id}: failed with error")
+            logger.exception("Task %s: failed with error", task_id)
             yield pb.ExecuteTaskResponse(
                 error=pb.ErrorDetail(
                     code="EXECUTION_ERROR",
@@ -187,17 +349,14 @@ class TaskExecutorServicer:
         task_id = request.task_id
 
         if task_id in self.active_tasks:
-            self.active_tasks[task_id]["cancelled"] = True
-            logger.info(f"Task {task_id}: cancel requested, reason: {request.reason}")
+            self.active_tasks[task_id].cancel()
+            logger.info("Task %s: cancel requested, reason: %s", task_id, request.reason)
             return pb.CancelTaskResponse(
                 success=True,
                 message=f"Task {task_id} cancellation requested"
             )
 
-        return pb.CancelTaskResponse(
-            success=False,
-            message=f"Task {task_id} not found or already completed"
-        )
+        return _CANCEL_NOT_FOUND
 
     async def HealthCheck(
         self,
@@ -210,8 +369,8 @@ class TaskExecutorServicer:
             message="Service is healthy",
             details={
                 "active_tasks": str(len(self.active_tasks)),
-                "registered_handlers": str(len(self.handlers)),
-                "handlers": ",".join(self.handlers.keys())
+                "registered_handlers": self._handlers_count_str,
+                "handlers": self._handlers_csv
             }
         )
 
@@ -226,20 +385,30 @@ class TaskExecutorServicer:
         return isinstance(error, retryable_types)
 
 
-def create_progress(
+def now_ms() -> int:
+    """Current wall-clock time in milliseconds, as used by Progress.timestamp_ms."""
+    return time.time_ns() // 1_000_000
+
+
+def create_progress_at(
     task_id: str,
     percentage: int,
     stage: str,
+    timestamp_ms: int,
     message: str = "",
     metadata: Optional[Dict[str, str]] = None
 ) -> Any:
     """
-    Helper function to create a progress response.
+    Helper function to create a progress response with a given timestamp.
+
+    Lets handlers read the clock once per tick and reuse it for every
+    update emitted in that tick.
 
     Args:
         task_id: The task ID
         percentage: Completion percentage (0-100)
         stage: Current processing stage
+        timestamp_ms: Wall-clock timestamp in milliseconds
         message: Optional progress message
         metadata: Optional additional metadata
 
@@ -252,49 +421,337 @@ def create_progress(
             percentage=percentage,
             stage=stage,
             message=message,
-            timestamp_ms=int(time.time() * 1000),
+            timestamp_ms=timestamp_ms,
             metadata=metadata or {}
         )
     )
 
 
+def create_progress(
+    task_id: str,
+    percentage: int,
+    stage: str,
+    message: str = "",
+    metadata: Optional[Dict[str, str]] = None
+) -> Any:
+    """
+    Helper function to create a progress response.
+
+    Args:
+        task_id: The task ID
+        percentage: Completion percentage (0-100)
+        stage: Current processing stage
+        message: Optional progress message
+        metadata: Optional additional metadata
+
+    Returns:
+        ExecuteTaskResponse containing progress
+    """
+    return create_progress_at(task_id, percentage, stage, now_ms(), message, metadata)
+
+
+class ProgressReporter:
+    """
+    Builds progress responses for a single task from a pool of reused messages.
+
+    Pooled responses keep their `task_id`; each `report()` only rewrites the
+    fields that change between updates. The servicer hands a response back
+    with `release()` once it has been yielded to gRPC, which serializes it
+    before pulling the next one, so it can be reused for a later update.
+    """
+
+    __slots__ = ("_task_id", "_free", "_leased")
+
+    def __init__(self, task_id: str):
+        self._task_id = task_id
+        self._free: List[Any] = []
+        # Leased responses keyed by id(); proto messages compare by value
+        self._leased: Dict[int, Any] = {}
+
+    def report(
+        self,
+        percentage: int,
+        stage: str,
+        timestamp_ms: int,
+        message: str = "",
+        metadata: Optional[Dict[str, str]] = None
+    ) -> Any:
+        """
+        Fill a pooled response with a progress update and return it.
+
+        Args:
+            percentage: Completion percentage (0-100)
+            stage: Current processing stage
+            timestamp_ms: Wall-clock timestamp in milliseconds
+            message: Optional progress message
+            metadata: Optional additional metadata
+
+        Returns:
+            ExecuteTaskResponse containing progress
+        """
+        if self._free:
+            response = self._free.pop()
+        else:
+            response = pb.ExecuteTaskResponse()
+            response.progress.task_id = self._task_id
+        self._leased[id(response)] = response
+
+        progress = response.progress
+        progress.percentage = percentage
+        progress.stage = stage
+        progress.message = message
+        progress.timestamp_ms = timestamp_ms
+        progress.metadata.clear()
+        if metadata:
+            progress.metadata.update(metadata)
+        return response
+
+    def release(self, response: Any):
+        """Return a sent response to the pool; responses built elsewhere are ignored."""
+        if self._leased.pop(id(response), None) is not None:
+            self._free.append(response)
+
+
+def _struct_to_dict(struct: struct_pb2.Struct) -> Dict[str, Any]:
+    return {key: _value_to_python(value) for key, value in struct.fields.items()}
+
+
+def _list_to_python(values: struct_pb2.ListValue) -> List[Any]:
+    return [_value_to_python(value) for value in values.values]
+
+
+# Converters keyed by the name of the populated `Value.kind` oneof field
+_VALUE_CONVERTERS: Dict[str, Callable[[Any], Any]] = {
+    "null_value": lambda _: None,
+    "number_value": lambda v: v,
+    "string_value": lambda v: v,
+    "bool_value": lambda v: v,
+    "struct_value": _struct_to_dict,
+    "list_value": _list_to_python,
+}
+
+
+def _value_to_python(value: struct_pb2.Value) -> Any:
+    kind = value.WhichOneof("kind")
+    if kind is None:
+        return None
+    return _VALUE_CONVERTERS[kind](getattr(value, kind))
+
+
 def payload_to_dict(payload: struct_pb2.Struct) -> Dict[str, Any]:
-    """Convert protobuf Struct to Python dict."""
-    from google.protobuf.json_format import MessageToDict
-    return MessageToDict(payload)
+    """
+    Convert protobuf Struct to Python dict.
+
+    Walks `Struct.fields` directly instead of going through
+    `json_format.MessageToDict`, which round-trips every value through
+    its generic JSON conversion. Numbers are returned as floats.
+    """
+    return _struct_to_dict(payload)
+
+
+# Payloads larger than this (serialized bytes) are converted off the event loop
+PAYLOAD_OFFLOAD_BYTES = 4096
+
+
+async def payload_to_dict_async(payload: struct_pb2.Struct) -> Dict[str, Any]:
+    """
+    Convert protobuf Struct to Python dict without blocking the event loop.
+
+    Large payloads are converted on a worker thread so concurrent RPCs keep
+    being served; small ones are converted inline, where the thread hop
+    would cost more than the conversion itself.
+    """
+    if payload.ByteSize() > PAYLOAD_OFFLOAD_BYTES:
+        return await asyncio.to_thread(payload_to_dict, payload)
+    return payload_to_dict(payload)
+
+
+def payload_get(payload: struct_pb2.Struct, key: str, default: Any = None) -> Any:
+    """
+    Read a single key from a protobuf Struct without converting the whole payload.
+
+    Args:
+        payload: The request payload
+        key: Top-level key to look up
+        default: Value returned when the key is missing or null
+
+    Returns:
+        The converted value, or `default`
+    """
+    # Index through .get(): subscripting a missing key would insert it
+    value = payload.fields.get(key)
+    if value is None:
+        return default
+    result = _value_to_python(value)
+    return default if result is None else result
+
+
+def payload_get_int(payload: struct_pb2.Struct, key: str, default: int = 0) -> int:
+    """Read a single key from a protobuf Struct as int."""
+    return int(payload_get(payload, key, default))
+
+
+def payload_get_str(payload: struct_pb2.Struct, key: str, default: str = "") -> str:
+    """Read a single key from a protobuf Struct as str."""
+    return str(payload_get(payload, key, default))
 
 
 # =============================================================================
 # Example Handlers
 # =============================================================================
 
+# Only plans up to this size are memoized; larger ones are computed per step
+_DEMO_PLAN_MAX_COUNT = 100
+_DEMO_PLAN_MAX_MESSAGE_LEN = 256
+
+
+def _iter_demo_steps(count: int, message: str) -> Iterator[Tuple[int, str]]:
+    for i in range(count):
+        yield int((i + 1) / count * 100), f"Step {i + 1}/{count}: {message}"
+
+
+@functools.lru_cache(maxsize=128)
+def _demo_plan(count: int, message: str) -> Tuple[Tuple[int, str], ...]:
+    """Precompute (percentage, message) steps; repeated payloads reuse the plan."""
+    return tuple(_iter_demo_steps(count, message))
+
+
+def _demo_steps(count: int, message: str) -> Iterable[Tuple[int, str]]:
+    """
+    Return the (percentage, message) steps for a demo task.
+
+    `count` and `message` come from the client, so only small plans are
+    memoized; larger ones are produced lazily to keep memory bounded and
+    avoid building the whole plan on the event loop.
+    """
+    if count <= _DEMO_PLAN_MAX_COUNT and len(message) <= _DEMO_PLAN_MAX_MESSAGE_LEN:
+        return _demo_plan(count, message)
+    return _iter_demo_steps(count, message)
+
+
+# Simulated LLM response, precomputed as (percentage, token, token_index) steps
+_CHAT_TOKENS = ("Hello", " there", "!", " I'm", " a", " simulated",
+                " LLM", " response", " for", " testing", ".")
+_CHAT_STEPS = tuple(
+    (int((i + 1) / len(_CHAT_TOKENS) * 100), token, str(i))
+    for i, token in enumerate(_CHAT_TOKENS)
+)
+
+# Tokens arriving within the flush interval of the previous update are
+# buffered into one update, up to this many tokens per update
+_CHAT_FLUSH_TOKENS = 8
+_CHAT_FLUSH_INTERVAL = 0.05
+
+
+def _chat_update(steps: List[Tuple[int, str, str]]) -> Tuple[int, str, Dict[str, str]]:
+    percentage, _, token_index = steps[-1]
+    metadata = {"token_index": token_index}
+    if len(steps) > 1:
+        metadata["token_count"] = str(len(steps))
+    return percentage, "".join(token for _, token, _ in steps), metadata
+
+
+async def _coalesce_tokens(
+    steps: AsyncIterator[Tuple[int, str, str]]
+) -> AsyncIterator[Tuple[int, str, Dict[str, str]]]:
+    """
+    Group streamed (percentage, token, token_index) steps into progress updates.
+
+    A token arriving at least one flush interval after the previous update is
+    sent at once. Faster tokens are buffered until that interval elapses or
+    the buffer is full; the next token is raced against the deadline, so a
+    stall in generation does not hold buffered tokens back.
+
+    Yields:
+        (percentage, message, metadata) per update; an update holding a
+        single token has the same metadata as an unbatched one
+    """
+    loop = asyncio.get_running_loop()
+    pending: List[Tuple[int, str, str]] = []
+    last_flush = loop.time() - _CHAT_FLUSH_INTERVAL
+    next_step: Optional[asyncio.Future] = None
+    try:
+        while True:
+            if next_step is None:
+                next_step = asyncio.ensure_future(steps.__anext__())
+            if pending:
+                deadline = last_flush + _CHAT_FLUSH_INTERVAL
+                await asyncio.wait((next_step,), timeout=max(deadline - loop.time(), 0))
+            else:
+                await asyncio.wait((next_step,))
+
+            if next_step.done():
+                try:
+                    pending.append(next_step.result())
+                except StopAsyncIteration:
+                    break
+                finally:
+                    next_step = None
+                if (
+                    len(pending) < _CHAT_FLUSH_TOKENS
+                    and loop.time() - last_flush < _CHAT_FLUSH_INTERVAL
+                ):
+                    continue
+
+            yield _chat_update(pending)
+            pending = []
+            last_flush = loop.time()
+
+        if pending:
+            yield _chat_update(pending)
+    finally:
+        if next_step is not None and not next_step.done():
+            next_step.cancel()
+            await asyncio.wait((next_step,))
+        aclose = getattr(steps, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+
+# Number of synthetic price bars fed to the backtest kernel
+_BACKTEST_BARS = 100_000
+
+# Backtest stages, precomputed as (percentage, stage, message) steps
+_BACKTEST_STAGES = (
+    ("loading_data", "Loading historical data..."),
+    ("preprocessing", "Preprocessing data..."),
+    ("running_backtest", "Running backtest simulation..."),
+    ("calculating_metrics", "Calculating performance metrics..."),
+    ("generating_report", "Generating report..."),
+)
+_BACKTEST_STEPS = tuple(
+    (int((i + 1) / len(_BACKTEST_STAGES) * 100), stage, message)
+    for i, (stage, message) in enumerate(_BACKTEST_STAGES)
+)
+
+
 async def demo_handler(
     request: Any,
     context: grpc.aio.ServicerContext,
-    task_state: dict
+    task_state: TaskState
 ) -> AsyncIterator[Any]:
     """
     Demo handler that simulates work with progress updates.
     """
     task_id = request.task_id
-    payload = payload_to_dict(request.payload)
+    message = payload_get_str(request.payload, "message", "Hello")
+    count = payload_get_int(request.payload, "count", 5)
 
-    message = payload.get("message", "Hello")
-    count = int(payload.get("count", 5))
+    logger.info("Demo task %s: message=%s, count=%d", task_id, message, count)
 
-    logger.info(f"Demo task {task_id}: message={message}, count={count}")
+    progress = task_state.progress
 
-    for i in range(count):
-        if task_state.get("cancelled"):
+    for percentage, step_message in _demo_steps(count, message):
+        if task_state.cancelled:
             return
 
         await asyncio.sleep(0.5)  # Simulate work
 
-        yield create_progress(
-            task_id=task_id,
-            percentage=int((i + 1) / count * 100),
+        yield progress.report(
+            percentage=percentage,
             stage="processing",
-            message=f"Step {i + 1}/{count}: {message}"
+            timestamp_ms=now_ms(),
+            message=step_message
         )
 
     # Handler doesn't need to yield final result - servicer handles it
@@ -303,73 +760,82 @@ async def demo_handler(
 async def chat_handler(
     request: Any,
     context: grpc.aio.ServicerContext,
-    task_state: dict
+    task_state: TaskState
 ) -> AsyncIterator[Any]:
     """
     Example LLM chat handler that simulates streaming response.
     """
     task_id = request.task_id
-    payload = payload_to_dict(request.payload)
+    prompt = payload_get_str(request.payload, "prompt")
+    max_tokens = payload_get_int(request.payload, "max_tokens", 100)
 
-    prompt = payload.get("prompt", "")
-    max_tokens = int(payload.get("max_tokens", 100))
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Chat task %s: prompt='%s...', max_tokens=%d", task_id, prompt[:50], max_tokens)
 
-    logger.info(f"Chat task {task_id}: prompt='{prompt[:50]}...', max_tokens={max_tokens}")
+    progress = task_state.progress
 
-    # Simulate streaming LLM response
-    response_tokens = ["Hello", " there", "!", " I'm", " a", " simulated",
-                      " LLM", " response", " for", " testing", "."]
-
-    for i, token in enumerate(response_tokens):
-        if task_state.get("cancelled"):
-            return
-
-        await asyncio.sleep(0.1)  # Simulate token generation
+    async def generate_tokens() -> AsyncIterator[Tuple[int, str, str]]:
+        # Simulate streaming LLM response
+        for step in _CHAT_STEPS:
+            if task_state.cancelled:
+                return
+            await asyncio.sleep(0.1)  # Simulate token generation
+            yield step
 
-        yield create_progress(
-            task_id=task_id,
-            percentage=int((i + 1) / len(response_tokens) * 100),
+    async for percentage, message, metadata in _coalesce_tokens(generate_tokens()):
+        yield progress.report(
+            percentage=percentage,
             stage="generating",
-            message=token,  # Stream token as message
-            metadata={"token_index": str(i)}
+            timestamp_ms=now_ms(),
+            message=message,  # Stream buffered tokens as message
+            metadata=metadata
         )
 
 
 async def backtest_handler(
     request: Any,
     context: grpc.aio.ServicerContext,
-    task_state: dict
+    task_state: TaskState
 ) -> AsyncIterator[Any]:
     """
     Example trading strategy backtest handler.
     """
     task_id = request.task_id
-    payload = payload_to_dict(request.payload)
+    strategy_id = payload_get_str(request.payload, "strategy_id", "unknown")
+    start_date = payload_get_str(request.payload, "start_date", "2024-01-01")
 
-    strategy_id = payload.get("strategy_id", "unknown")
-    start_date = payload.get("start_date", "2024-01-01")
+    logger.info("Backtest task %s: strategy=%s, start=%s", task_id, strategy_id, start_date)
 
-    logger.info(f"Backtest task {task_id}: strategy={strategy_id}, start={start_date}")
+    progress = task_state.progress
 
-    stages = [
-        ("loading_data", "Loading historical data..."),
-        ("preprocessing", "Preprocessing data..."),
-        ("running_backtest", "Running backtest simulation..."),
-        ("calculating_metrics", "Calculating performance metrics..."),
-        ("generating_report", "Generating report...")
-    ]
+    prices: List[float] = []
 
-    for i, (stage, message) in enumerate(stages):
-        if task_state.get("cancelled"):
+    for percentage, stage, message in _BACKTEST_STEPS:
+        if task_state.cancelled:
             return
 
-        await asyncio.sleep(1.0)  # Simulate work
+        metadata = None
+        if stage == "loading_data":
+            prices = await asyncio.to_thread(
+                numeric.synthetic_prices, _BACKTEST_BARS, strategy_id
+            )
+        elif stage == "running_backtest":
+            # CPU-bound work runs on a worker thread; the compiled kernel
+            # releases the GIL so several backtests can run in parallel
+            total_return, max_drawdown = await asyncio.to_thread(numeric.backtest, prices)
+            metadata = {
+                "total_return": f"{total_return:.4f}",
+                "max_drawdown": f"{max_drawdown:.4f}",
+            }
+        else:
+            await asyncio.sleep(1.0)  # Simulate work
 
-        yield create_progress(
-            task_id=task_id,
-            percentage=int((i + 1) / len(stages) * 100),
+        yield progress.report(
+            percentage=percentage,
             stage=stage,
-            message=message
+            timestamp_ms=now_ms(),
+            message=message,
+            metadata=metadata
         )
 
 
@@ -386,6 +852,11 @@ async def serve(port: int = 50051):
     """
     if pb is None or pb_grpc is None:
         raise RuntimeError("Proto files not generated. Run generate_proto.sh first.")
+    if api_implementation.Type() == "python":
+        raise RuntimeError(
+            "protobuf is using the pure-Python implementation. "
+            "Install protobuf>=4.21 and set PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION=upb."
+        )
 
     servicer = TaskExecutorServicer()
 
@@ -394,27 +865,39 @@ async def serve(port: int = 50051):
     servicer.register_handler("chat", chat_handler)
     servicer.register_handler("backtest", backtest_handler)
 
-    server = grpc.aio.server(futures.ThreadPoolExecutor(max_workers=10))
+    server = grpc.aio.server(
+        migration_thread_pool=futures.ThreadPoolExecutor(max_workers=SERVER_THREAD_POOL_SIZE),
+        options=SERVER_OPTIONS,
+    )
     pb_grpc.add_TaskExecutorServiceServicer_to_server(servicer, server)
 
     listen_addr = f'[::]:{port}'
     server.add_insecure_port(listen_addr)
 
     # Setup graceful shutdown
-    loop = asyncio.get_event_loop()
-
-    async def shutdown():
-        logger.info("Shutting down server...")
-        await server.stop(5)  # 5 second grace period
+    loop = asyncio.get_running_loop()
+    shutdown_event = asyncio.Event()
 
     for sig in (signal.SIGINT, signal.SIGTERM):
-        loop.add_signal_handler(sig, lambda: asyncio.create_task(shutdown()))
+        loop.add_signal_handler(sig, shutdown_event.set)
 
-    logger.info(f"Starting Python Task Executor Service on {listen_addr}")
-    logger.info(f"Registered handlers: {list(servicer.handlers.keys())}")
+    logger.info("Starting Python Task Executor Service on %s", listen_addr)
+    logger.info("Registered handlers: %s", list(servicer.handlers.keys()))
 
     await server.start()
-    await server.wait_for_termination()
+
+    termination = asyncio.ensure_future(server.wait_for_termination())
+    shutdown_requested = asyncio.ensure_future(shutdown_event.wait())
+    await asyncio.wait(
+        (termination, shutdown_requested),
+        return_when=asyncio.FIRST_COMPLETED
+    )
+    if shutdown_requested.done():
+        logger.info("Shutting down server...")
+        await server.stop(5)  # 5 second grace period
+    else:
+        shutdown_requested.cancel()
+    await termination
 
 
 if __name__ == '__main__':